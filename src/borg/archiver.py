@@ -141,6 +141,7 @@ def __init__(self, lock_wait=None, prog=None):
         self.exit_code = EXIT_SUCCESS
         self.lock_wait = lock_wait
         self.prog = prog
+        self.parser = None  # built on first use by parse_args
 
     def print_error(self, msg, *args):
         msg = args and msg % args or msg
@@ -1932,7 +1933,8 @@ def process_epilog(epilog):
         subparsers = parser.add_subparsers(title='required arguments', metavar='<command>')
 
         # some empty defaults for all subparsers
-        common_parser.set_defaults(paths=[], patterns=[])
+        self.default_paths, self.default_patterns = [], []
+        common_parser.set_defaults(paths=self.default_paths, patterns=self.default_patterns)
 
         serve_epilog = process_epilog("""
         This command starts a repository server process. This command is usually not used manually.
@@ -3356,8 +3358,16 @@ def parse_args(self, args=None):
         # We can't use argparse for "serve" since we don't want it to show up in "Available commands"
         if args:
             args = self.preprocess_args(args)
-        parser = self.build_parser()
+        if self.parser is None:
+            # building the parser is expensive, reuse it for further parse_args calls
+            self.parser = self.build_parser()
+        parser = self.parser
+        # the pattern actions add to the default paths / patterns lists in-place, reset them
+        del self.default_paths[:]
+        del self.default_patterns[:]
         args = parser.parse_args(args or ['-h'])
+        # detach the result from the default lists (they get reset by the next parse_args call)
+        args.paths, args.patterns = list(args.paths), list(args.patterns)
         # This works around http://bugs.python.org/issue9351
         func = getattr(args, 'func', None) or getattr(args, 'fallback_func')
         if func == self.do_create and not args.paths: